@@ -13,36 +13,67 @@ The script provides information about:
 - Other special cases
 
 It also groups packages by their high-level dependencies, which can be cached for performance.
+Library-to-package lookups are cached as well and reused until the RPM database changes.
+Both caches are kept in ~/.cache/elf_rockylinux_dependency_analyzer.
 
 Usage:
-    python3 elf_dependency_analyzer.py [--rebuild-cache] <file_or_directory> [<file_or_directory> ...]
+    python3 elf_dependency_analyzer.py [--rebuild-cache] [--jobs N] [--local-prefix PATH] [--no-transitive-skip]
+                                       [--quiet] <file_or_directory> [<file_or_directory> ...]
 
 The script will automatically determine if each argument is a file or directory and process accordingly.
 Use --rebuild-cache to force rebuilding of the high-level packages cache.
+Use --jobs to limit how many binaries in a directory are analyzed concurrently; it also bounds
+the parallel repoquery calls made while building the high-level packages cache.
+Use --local-prefix (repeatable) to report libraries under an install prefix, such as
+/usr/local/cloudberry-db, as custom libraries without querying rpm for them.
+Shared objects that a scanned executable already depends on are skipped, since ldd reports
+transitive dependencies; use --no-transitive-skip to analyze them anyway.
+Use --quiet to print only the grand summary instead of a report for every binary.
 
 Requirements:
 - Python 3.6+
-- prettytable (pip install prettytable)
-- python-dateutil (pip install python-dateutil)
 - ldd (usually pre-installed on Linux systems)
-- file (usually pre-installed on Linux systems)
 - rpm (usually pre-installed on RPM-based Linux distributions)
+- rpm Python bindings (optional, python3-rpm; queries the RPM database in-process instead of forking rpm)
 - repoquery (part of yum-utils package)
+- dnf Python bindings (optional, python3-dnf; resolves package dependencies in-process instead of running repoquery)
 
 Functions:
 - check_requirements(): Checks if all required commands are available.
-- run_command(command): Executes a shell command and returns its output.
-- parse_ldd_line(line): Parses a line of ldd output to extract the library name.
+- iter_lines(command, check): Executes a command and yields its output line by line as it is produced.
+- parse_ldd_line(line): Parses a line of ldd output into the library name and resolved path.
+- get_ld_library_index(): Indexes the files in LD_LIBRARY_PATH directories once per run.
 - find_library_in_ld_library_path(lib_name): Searches for a library in LD_LIBRARY_PATH.
+- resolve_library_path(lib_path): Resolves a library path, falling back to LD_LIBRARY_PATH.
+- parse_rpm_query_line(line): Parses a line of rpm -qf output into package information.
+- is_local_library(lib_path): Checks if a library lives under one of the --local-prefix paths.
+- get_transaction_set(): Opens the RPM database once when the rpm Python bindings are available.
+- query_rpmdb(lib_path): Looks up the package owning a file through the rpm Python bindings.
 - get_package_info(lib_path): Gets package information for a given library.
-- get_package_dependencies(package): Gets dependencies of a package using repoquery.
-- build_high_level_packages(grand_summary): Builds a mapping of high-level packages to their dependencies.
-- load_or_build_high_level_packages(grand_summary, force_rebuild): Loads or builds the high-level packages cache.
-- print_summary(packages, special_cases, missing_libraries, binary_path): Prints a summary for a single binary.
-- process_binary(binary_path): Processes a single binary file.
-- is_elf_binary(file_path): Checks if a file is an ELF binary.
+- prime_package_info(lib_paths): Resolves owning packages for many libraries with batched rpm calls.
+- get_rpmdb_token(): Returns a token identifying the current state of the RPM database.
+- load_pickle(path): Loads a cache file, treating a missing or unreadable file as a cache miss.
+- save_pickle(path, data): Writes a cache file atomically through a temporary file.
+- save_package_info_cache(rpmdb_token): Saves library-to-package lookups for later runs.
+- load_package_info_cache(): Loads cached library-to-package lookups and saves them on exit.
+- get_dnf_sack(): Loads the dnf package sack once when the dnf Python bindings are available.
+- query_dnf_dependencies(query, package): Gets dependencies of a package from a dnf sack query.
+- get_package_dependencies(package): Gets dependencies of a package using dnf or repoquery.
+- build_high_level_packages(grand_summary, jobs): Builds a mapping of high-level packages to their dependencies.
+- load_or_build_high_level_packages(grand_summary, force_rebuild, jobs): Loads or builds the high-level packages cache.
+- format_table(headers, rows): Renders rows as a left-aligned text table; cells may span several lines.
+- print_summary(packages, special_cases, missing_libraries, binary_path, out): Prints a summary for a single binary.
+- get_ldd_output(binary_path, out): Runs ldd for a binary, caching the output lines or error per resolved path.
+- get_library_paths(ldd_output): Extracts resolved library paths from ldd output lines.
+- process_binary(binary_path, out): Processes a single binary file.
+- process_binary_buffered(binary_path): Processes a binary and returns its report as a string.
+- has_elf_header(file_path, inode_key): Checks the ELF header of a file, caching the result per inode.
+- iter_elf_binaries(directory): Walks a directory tree and yields the ELF binaries in it with their inode keys.
+- group_hardlinks(elf_entries): Keeps one path per inode and maps it to its hardlinked aliases.
 - print_grand_summary(...): Prints a grand summary of all processed binaries.
-- analyze_path(path, grand_summary, grand_special_cases, grand_missing_libraries): Analyzes a file or directory.
+- is_shared_object_name(file_path): Checks if a file name looks like a shared object.
+- analyze_path(path, grand_summary, grand_special_cases, grand_missing_libraries, jobs, transitive_skip, quiet):
+  Analyzes a file or directory.
 - main(): Main function to handle command-line arguments and initiate the analysis.
 
 This script is designed to help system administrators and developers understand the dependencies
@@ -50,18 +81,53 @@ of ELF binaries in their systems, which can be useful for troubleshooting, optim
 preparing deployment packages.
 """
 
-import os, subprocess, re, sys, json, shutil
+import os, subprocess, re, sys, pickle, shutil, functools, io, atexit, threading, time
+import concurrent.futures
 from collections import defaultdict
-from datetime import datetime, timedelta
 import argparse
-from prettytable import PrettyTable
-from dateutil import parser
 
-CACHE_FILE = 'high_level_packages_cache.json'
+try:
+    import rpm
+except ImportError:
+    rpm = None
+
+try:
+    import dnf
+except ImportError:
+    dnf = None
+
+# Caches are pickles, so they live in a per-user directory rather than the working
+# directory, which may be a build tree that other users can write to.
+CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'elf_rockylinux_dependency_analyzer')
+CACHE_FILE = os.path.join(CACHE_DIR, 'high_level_packages_cache.pkl')
 CACHE_EXPIRY_DAYS = 7
+RPMQF_CACHE_FILE = os.path.join(CACHE_DIR, 'rpm_qf_cache.pkl')
+RPMDB_FILES = ['/var/lib/rpm/rpmdb.sqlite', '/var/lib/rpm/Packages']
+RPM_QUERY_FORMAT = '%{NAME}\t%{NAME}-%{VERSION}-%{RELEASE}.%{ARCH}\n'
+BATCH_SIZE = 500
+DEFAULT_JOBS = min(32, (os.cpu_count() or 1) * 4)
+# Every repoquery process loads the repository metadata, so fewer of them run at once.
+REPOQUERY_MAX_JOBS = 8
+ELF_MAGIC = b'\x7fELF'
+ELF_EXECUTABLE_TYPES = (2, 3)  # ET_EXEC, ET_DYN
+
+# The vDSO and the dynamic loader show up in ldd output but are never packaged libraries to look up.
+KNOWN_SPECIAL_LIBRARIES = frozenset({
+    'linux-vdso.so.1', 'linux-gate.so.1', 'ld-linux-x86-64.so.2', 'ld-linux-aarch64.so.1', 'ld-linux.so.2',
+})
+
+# Matches "name => path (0xaddr)" and "name => not found"; the path group is None for the latter.
+LDD_LINE_RE = re.compile(r'^\s*(?P<name>\S+)\s+=>\s+(?:(?P<path>\S+)\s+\(0x[0-9a-f]+\)|not found)\s*$')
+
+_package_info_cache = {}
+_local_prefixes = ()
+_rpmdb_lock = threading.Lock()
+_dnf_lock = threading.Lock()
+_ldd_cache = {}
+_elf_inode_cache = {}
 
 def check_requirements():
-    required_commands = ['ldd', 'file', 'rpm', 'repoquery']
+    required_commands = ['ldd', 'rpm', 'repoquery']
     missing_commands = [cmd for cmd in required_commands if shutil.which(cmd) is None]
     if missing_commands:
         print("Error: The following required commands are missing:")
@@ -72,155 +138,360 @@ def check_requirements():
             print("Note: 'repoquery' is typically part of the 'yum-utils' package.")
         sys.exit(1)
 
-def run_command(command):
-    try:
-        return subprocess.check_output(command, stderr=subprocess.STDOUT).decode('utf-8')
-    except subprocess.CalledProcessError as e:
-        print(f"Error running command {' '.join(command)}: {e.output.decode('utf-8').strip()}")
-        return None
+def iter_lines(command, check=True):
+    # stderr is only collected when it is reported; it is read after stdout
+    # reaches EOF, which is fine for the short diagnostics ldd and rpm emit.
+    with subprocess.Popen(command, stdout=subprocess.PIPE,
+                          stderr=subprocess.PIPE if check else subprocess.DEVNULL,
+                          universal_newlines=True, bufsize=1) as process:
+        yield from process.stdout
+        error_output = process.stderr.read() if check else ''
+    if check and process.returncode:
+        raise subprocess.CalledProcessError(process.returncode, command, stderr=error_output)
 
 def parse_ldd_line(line):
-    match = re.search(r'\s*(\S+) => (\S+) \((0x[0-9a-f]+)\)', line)
-    return match.group(1) if match else None
+    match = LDD_LINE_RE.match(line)
+    return (match['name'], match['path']) if match else None
+
+@functools.lru_cache(maxsize=None)
+def get_ld_library_index():
+    # LD_LIBRARY_PATH does not change during a run, so list each directory once;
+    # earlier directories win, as they do for the dynamic linker.
+    index = {}
+    for directory in os.environ.get('LD_LIBRARY_PATH', '').split(':'):
+        try:
+            with os.scandir(directory or '.') as entries:
+                for entry in entries:
+                    if entry.is_file():
+                        index.setdefault(entry.name, os.path.join(directory, entry.name))
+        except OSError:
+            continue
+    return index
 
 def find_library_in_ld_library_path(lib_name):
-    ld_library_path = os.environ.get('LD_LIBRARY_PATH', '')
-    for directory in ld_library_path.split(':'):
-        potential_path = os.path.join(directory, lib_name)
-        if os.path.isfile(potential_path):
-            return potential_path
-    return None
+    return get_ld_library_index().get(lib_name)
 
-def get_package_info(lib_path):
+def resolve_library_path(lib_path):
     if not os.path.isfile(lib_path):
         lib_name = os.path.basename(lib_path)
         lib_path = find_library_in_ld_library_path(lib_name)
         if not lib_path:
             return None
-    try:
-        full_package_name = run_command(['rpm', '-qf', lib_path])
-        if full_package_name:
-            package_name = full_package_name.split('-')[0]
-            return package_name, full_package_name.strip()
-    except subprocess.CalledProcessError:
-        pass
+    # Key by the resolved path so symlinked aliases of a library share one lookup.
+    return os.path.realpath(lib_path)
+
+def parse_rpm_query_line(line):
+    # Files without an owner produce "file ... is not owned by any package" instead.
+    if '\t' not in line:
+        return None
+    package_name, full_package_name = line.split('\t', 1)
+    return package_name, full_package_name.strip()
+
+def is_local_library(lib_path):
+    return lib_path.startswith(_local_prefixes)
+
+@functools.lru_cache(maxsize=None)
+def get_transaction_set():
+    return rpm.TransactionSet()
+
+def query_rpmdb(lib_path):
+    # A TransactionSet is not safe to share between threads without a lock.
+    with _rpmdb_lock:
+        for header in get_transaction_set().dbMatch(rpm.RPMDBI_BASENAMES, lib_path):
+            name, version, release, arch = (value.decode() if isinstance(value, bytes) else value
+                                            for value in (header['name'], header['version'],
+                                                          header['release'], header['arch']))
+            return name, f"{name}-{version}-{release}.{arch}"
+    return None
+
+def get_package_info(lib_path):
+    if is_local_library(lib_path):
+        return None
+    lib_path = resolve_library_path(lib_path)
+    if not lib_path or is_local_library(lib_path):
+        return None
+    if lib_path not in _package_info_cache:
+        if rpm is not None:
+            _package_info_cache[lib_path] = query_rpmdb(lib_path)
+        else:
+            lines = list(iter_lines(['rpm', '-qf', '--qf', RPM_QUERY_FORMAT, lib_path], check=False))
+            _package_info_cache[lib_path] = parse_rpm_query_line(lines[0]) if lines else None
+    return _package_info_cache[lib_path]
+
+def prime_package_info(lib_paths):
+    # With the rpm bindings every lookup is already an in-process database probe.
+    if rpm is not None:
+        return
+    real_paths = {resolve_library_path(lib_path) for lib_path in lib_paths if not is_local_library(lib_path)}
+    pending = sorted(lib_path for lib_path in real_paths
+                     if lib_path and lib_path not in _package_info_cache and not is_local_library(lib_path))
+    for i in range(0, len(pending), BATCH_SIZE):
+        batch = pending[i:i + BATCH_SIZE]
+        lines = iter_lines(['rpm', '-qf', '--qf', RPM_QUERY_FORMAT, *batch], check=False)
+        resolved = {lib_path: parse_rpm_query_line(line) for lib_path, line in zip(batch, lines)}
+        # rpm prints one line per path unless a file has several owners; those
+        # batches are left for get_package_info to resolve one path at a time.
+        if len(resolved) == len(batch) and next(lines, None) is None:
+            _package_info_cache.update(resolved)
+
+def get_rpmdb_token():
+    for rpmdb_file in RPMDB_FILES:
+        try:
+            st = os.stat(rpmdb_file)
+        except OSError:
+            continue
+        return f"{rpmdb_file}:{st.st_mtime_ns}:{st.st_size}"
     return None
 
+def load_pickle(path):
+    try:
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, KeyError):
+        return None
+
+def save_pickle(path, data):
+    # A reader never sees a partially written file, even if this process is killed mid-write.
+    os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+def save_package_info_cache(rpmdb_token):
+    try:
+        save_pickle(RPMQF_CACHE_FILE, {'rpmdb': rpmdb_token, 'query_format': RPM_QUERY_FORMAT,
+                                       'packages': _package_info_cache})
+    except OSError as e:
+        print(f"Error writing cache {RPMQF_CACHE_FILE}: {e}")
+
+def load_package_info_cache():
+    rpmdb_token = get_rpmdb_token()
+    if rpmdb_token is None:
+        return
+    cache_data = load_pickle(RPMQF_CACHE_FILE)
+    if (isinstance(cache_data, dict) and cache_data.get('rpmdb') == rpmdb_token
+            and cache_data.get('query_format') == RPM_QUERY_FORMAT and 'packages' in cache_data):
+        _package_info_cache.update(cache_data['packages'])
+    atexit.register(save_package_info_cache, rpmdb_token)
+
+@functools.lru_cache(maxsize=None)
+def get_dnf_sack():
+    # Returns the Base alongside its query; closing the Base would invalidate the sack.
+    base = dnf.Base()
+    try:
+        base.conf.read()
+        base.read_all_repos()
+        base.fill_sack(load_system_repo=True, load_available_repos=True)
+    except dnf.exceptions.Error as e:
+        print(f"Error loading dnf repositories, falling back to repoquery: {e}")
+        return None
+    return base, base.sack.query()
+
+def query_dnf_dependencies(query, package):
+    requires = [req for pkg in query.filter(name=package).latest() for req in pkg.requires]
+    if not requires:
+        return frozenset()
+    return frozenset(str(pkg) for pkg in query.filter(provides=requires))
+
+@functools.lru_cache(maxsize=None)
 def get_package_dependencies(package):
+    if dnf is not None:
+        # The sack is loaded once and is not safe to query from several threads at a time.
+        with _dnf_lock:
+            dnf_sack = get_dnf_sack()
+            if dnf_sack is not None:
+                return query_dnf_dependencies(dnf_sack[1], package)
     try:
         output = subprocess.check_output(['repoquery', '--requires', '--resolve', package],
                                          universal_newlines=True, stderr=subprocess.DEVNULL)
-        return set(output.strip().split('\n'))
+        return frozenset(output.strip().split('\n'))
     except subprocess.CalledProcessError:
-        return set()
+        return frozenset()
 
-def build_high_level_packages(grand_summary):
+def build_high_level_packages(grand_summary, jobs=DEFAULT_JOBS):
     all_packages = set()
     for packages in grand_summary.values():
         all_packages.update(package.split('-')[0] for package in packages)
+    all_packages = sorted(all_packages)
     high_level_packages = {}
-    for package in all_packages:
-        deps = get_package_dependencies(package)
-        if deps:
-            high_level_packages[package] = [dep.split('-')[0] for dep in deps]
+    with concurrent.futures.ThreadPoolExecutor(max_workers=min(jobs, REPOQUERY_MAX_JOBS)) as executor:
+        for package, deps in zip(all_packages, executor.map(get_package_dependencies, all_packages)):
+            if deps:
+                high_level_packages[package] = [dep.split('-')[0] for dep in deps]
     return high_level_packages
 
-def load_or_build_high_level_packages(grand_summary, force_rebuild=False):
-    if not force_rebuild and os.path.exists(CACHE_FILE):
-        with open(CACHE_FILE, 'r') as f:
-            cache_data = json.load(f)
-        if datetime.now() - parser.parse(cache_data['timestamp']) < timedelta(days=CACHE_EXPIRY_DAYS):
+def load_or_build_high_level_packages(grand_summary, force_rebuild=False, jobs=DEFAULT_JOBS):
+    if not force_rebuild:
+        cache_data = load_pickle(CACHE_FILE)
+        if (isinstance(cache_data, dict) and 'packages' in cache_data
+                and time.time() - cache_data.get('timestamp', 0) < CACHE_EXPIRY_DAYS * 24 * 60 * 60):
             return cache_data['packages']
-    packages = build_high_level_packages(grand_summary)
-    with open(CACHE_FILE, 'w') as f:
-        json.dump({'timestamp': datetime.now().isoformat(), 'packages': packages}, f)
+    packages = build_high_level_packages(grand_summary, jobs)
+    try:
+        save_pickle(CACHE_FILE, {'timestamp': time.time(), 'packages': packages})
+    except OSError as e:
+        print(f"Error writing cache {CACHE_FILE}: {e}")
     return packages
 
-def print_summary(packages, special_cases, missing_libraries, binary_path):
-    print("\nSummary of unique runtime packages required:")
-    table = PrettyTable(['Package Name', 'Full Package Name'])
-    table.align['Package Name'] = 'l'
-    table.align['Full Package Name'] = 'l'
-    unique_packages = sorted(set(packages))
-    for package_name, full_package_name in unique_packages:
-        table.add_row([package_name, full_package_name])
-    print(table)
+def format_table(headers, rows):
+    rows = [[cell.split('\n') for cell in row] for row in rows]
+    widths = [len(header) for header in headers]
+    for row in rows:
+        for i, cell_lines in enumerate(row):
+            widths[i] = max(widths[i], max(len(line) for line in cell_lines))
+    border = '+' + '+'.join('-' * (width + 2) for width in widths) + '+'
+    def format_line(cells):
+        return '| ' + ' | '.join(f"{cell:<{width}}" for cell, width in zip(cells, widths)) + ' |'
+    lines = [border, format_line(headers), border]
+    for row in rows:
+        for i in range(max(len(cell_lines) for cell_lines in row)):
+            lines.append(format_line(cell_lines[i] if i < len(cell_lines) else '' for cell_lines in row))
+    lines.append(border)
+    return '\n'.join(lines)
+
+def print_summary(packages, special_cases, missing_libraries, binary_path, out=None):
+    out = out or sys.stdout
+    print("\nSummary of unique runtime packages required:", file=out)
+    print(format_table(['Package Name', 'Full Package Name'], sorted(packages)), file=out)
     if missing_libraries:
-        print("\nMISSING LIBRARIES:")
-        missing_table = PrettyTable(['Missing Library', 'Referenced By'])
-        missing_table.align['Missing Library'] = 'l'
-        missing_table.align['Referenced By'] = 'l'
-        for lib in missing_libraries:
-            missing_table.add_row([lib, binary_path])
-        print(missing_table)
+        print("\nMISSING LIBRARIES:", file=out)
+        print(format_table(['Missing Library', 'Referenced By'],
+                           [[lib, binary_path] for lib in missing_libraries]), file=out)
     if special_cases:
-        print("\nSPECIAL CASES:")
-        special_table = PrettyTable(['Library/Case', 'Referenced By', 'Category'])
-        special_table.align['Library/Case'] = 'l'
-        special_table.align['Referenced By'] = 'l'
-        special_table.align['Category'] = 'l'
+        print("\nSPECIAL CASES:", file=out)
+        rows = []
         for case in special_cases:
             category = "Custom/Non-RPM" if "custom or non-RPM library" in case else "Other"
             library = case.split(" is ")[0] if " is " in case else case
-            special_table.add_row([library, binary_path, category])
-        print(special_table)
+            rows.append([library, binary_path, category])
+        print(format_table(['Library/Case', 'Referenced By', 'Category'], rows), file=out)
     else:
-        print("\nSPECIAL CASES: None found")
-
-def process_binary(binary_path):
-    print(f"Binary: {binary_path}\n")
-    print("Libraries and their corresponding packages:")
-    packages, special_cases, missing_libraries = [], [], []
-    known_special_cases = ['linux-vdso.so.1', 'ld-linux-x86-64.so.2']
-    ldd_output = run_command(['ldd', binary_path])
+        print("\nSPECIAL CASES: None found", file=out)
+
+def get_ldd_output(binary_path, out=None):
+    # The error is kept with the result and only printed when a report is written,
+    # so failures seen by the prefetch pass land in the right binary's report.
+    real_path = os.path.realpath(binary_path)
+    if real_path not in _ldd_cache:
+        try:
+            _ldd_cache[real_path] = list(iter_lines(['ldd', binary_path])), None
+        except subprocess.CalledProcessError as e:
+            _ldd_cache[real_path] = None, f"Error running command {' '.join(e.cmd)}: {e.stderr.strip()}"
+    ldd_output, error = _ldd_cache[real_path]
+    if error is not None and out is not None:
+        print(error, file=out)
+    return ldd_output
+
+def get_library_paths(ldd_output):
+    for line in ldd_output:
+        parsed = parse_ldd_line(line)
+        if parsed and parsed[1]:
+            yield parsed[1]
+
+def process_binary(binary_path, out=None):
+    out = out or sys.stdout
+    print(f"Binary: {binary_path}\n", file=out)
+    print("Libraries and their corresponding packages:", file=out)
+    packages, special_cases, missing_libraries = set(), [], []
+    ldd_output = get_ldd_output(binary_path, out)
     if ldd_output is None:
         return packages, special_cases, missing_libraries
-    for line in ldd_output.splitlines():
-        if any(special in line for special in known_special_cases):
+    # Resolve every library of this binary with one rpm call before reporting them.
+    prime_package_info(get_library_paths(ldd_output))
+    report = []
+    for line in ldd_output:
+        fields = line.split(None, 1)
+        if not fields or os.path.basename(fields[0]) in KNOWN_SPECIAL_LIBRARIES:
             continue
-        parts = line.split('=>')
-        lib_name = parts[0].strip()
-        if "not found" in line:
+        parsed = parse_ldd_line(line)
+        if parsed is None:
+            special_case = f"{line.strip()} is a special case or built-in library"
+            special_cases.append(special_case)
+            report.append(f"{line.strip()} => Special case or built-in library")
+            continue
+        lib_name, lib_path = parsed
+        if lib_path is None:
             missing_libraries.append(lib_name)
-            print(f"MISSING: {line.strip()}")
+            report.append(f"MISSING: {line.strip()}")
+            continue
+        package_info = get_package_info(lib_path)
+        if package_info:
+            report.append(f"{lib_path} => {package_info[1]}")
+            packages.add(package_info)
+        elif os.path.exists(lib_path):
+            special_case = f"{lib_path} is a custom or non-RPM library"
+            special_cases.append(special_case)
+            report.append(f"{lib_path} => Custom or non-RPM library")
         else:
-            if len(parts) > 1:
-                lib_path = parts[1].split()[0]
-                if lib_path != "not":
-                    package_info = get_package_info(lib_path)
-                    if package_info:
-                        print(f"{lib_path} => {package_info[1]}")
-                        packages.append(package_info)
-                    else:
-                        if os.path.exists(lib_path):
-                            special_case = f"{lib_path} is a custom or non-RPM library"
-                            special_cases.append(special_case)
-                            print(f"{lib_path} => Custom or non-RPM library")
-                        else:
-                            special_case = f"{lib_path} is not found and might be a special case"
-                            special_cases.append(special_case)
-                            print(f"{lib_path} => Not found, might be a special case")
-                else:
-                    special_case = f"{line.strip()} is a special case or built-in library"
-                    special_cases.append(special_case)
-                    print(f"{line.strip()} => Special case or built-in library")
-            else:
-                special_case = f"{line.strip()} is a special case or built-in library"
-                special_cases.append(special_case)
-                print(f"{line.strip()} => Special case or built-in library")
+            special_case = f"{lib_path} is not found and might be a special case"
+            special_cases.append(special_case)
+            report.append(f"{lib_path} => Not found, might be a special case")
     if special_cases:
-        print(f"Special cases found for {binary_path}:")
-        for case in special_cases:
-            print(f"  - {case}")
+        report.append(f"Special cases found for {binary_path}:")
+        report.extend(f"  - {case}" for case in special_cases)
     else:
-        print(f"No special cases found for {binary_path}")
-    print_summary(packages, special_cases, missing_libraries, binary_path)
-    print("-------------------------------------------")
+        report.append(f"No special cases found for {binary_path}")
+    print('\n'.join(report), file=out)
+    print_summary(packages, special_cases, missing_libraries, binary_path, out)
+    print("-------------------------------------------", file=out)
     return packages, special_cases, missing_libraries
 
-def is_elf_binary(file_path):
-    file_output = run_command(['file', file_path])
-    return 'ELF' in file_output and ('executable' in file_output or 'shared object' in file_output)
+def process_binary_buffered(binary_path):
+    out = io.StringIO()
+    packages, special_cases, missing_libraries = process_binary(binary_path, out)
+    return packages, special_cases, missing_libraries, out.getvalue()
+
+def has_elf_header(file_path, inode_key):
+    # Hardlinked copies share an inode, so only the first one is read.
+    if inode_key not in _elf_inode_cache:
+        try:
+            with open(file_path, 'rb') as f:
+                header = f.read(18)
+        except OSError:
+            header = b''
+        byteorder = 'big' if header[5:6] == b'\x02' else 'little'
+        _elf_inode_cache[inode_key] = (len(header) == 18 and header[:4] == ELF_MAGIC and
+                                       int.from_bytes(header[16:18], byteorder) in ELF_EXECUTABLE_TYPES)
+    return _elf_inode_cache[inode_key]
+
+def iter_elf_binaries(directory):
+    # Directory entries carry the file type and inode number from readdir, so a
+    # regular file costs a single open() and never a separate stat call.
+    try:
+        device = os.stat(directory).st_dev
+        with os.scandir(directory) as it:
+            entries = list(it)
+    except OSError:
+        return
+    subdirectories = []
+    for entry in entries:
+        if entry.is_dir(follow_symlinks=False):
+            subdirectories.append(entry.path)
+        elif entry.is_file(follow_symlinks=False):
+            inode_key = (device, entry.inode())
+            if has_elf_header(entry.path, inode_key):
+                yield entry.path, inode_key
+    for subdirectory in subdirectories:
+        yield from iter_elf_binaries(subdirectory)
+
+def group_hardlinks(elf_entries):
+    first_paths = {}
+    hardlinks = {}
+    for file_path, inode_key in elf_entries:
+        if inode_key in first_paths:
+            hardlinks[first_paths[inode_key]].append(file_path)
+        else:
+            first_paths[inode_key] = file_path
+            hardlinks[file_path] = []
+    return list(hardlinks), hardlinks
 
 def print_grand_summary(grand_summary, grand_special_cases, grand_missing_libraries, HIGH_LEVEL_PACKAGES, PACKAGE_TO_HIGH_LEVEL):
     if grand_summary or grand_special_cases or grand_missing_libraries:
@@ -229,75 +500,106 @@ def print_grand_summary(grand_summary, grand_special_cases, grand_missing_librar
         for package_name, full_package_names in grand_summary.items():
             high_level_package = PACKAGE_TO_HIGH_LEVEL.get(package_name.split('-')[0], package_name.split('-')[0])
             high_level_summary[high_level_package].update(full_package_names)
-        table = PrettyTable(['High-Level Package', 'Included Packages'])
-        table.align['High-Level Package'] = 'l'
-        table.align['Included Packages'] = 'l'
-        for high_level_package, full_package_names in sorted(high_level_summary.items()):
-            included_packages = '\n'.join(sorted(full_package_names))
-            table.add_row([high_level_package, included_packages])
-        print(table)
+        print(format_table(['High-Level Package', 'Included Packages'],
+                           [[high_level_package, '\n'.join(sorted(full_package_names))]
+                            for high_level_package, full_package_names in sorted(high_level_summary.items())]))
         if grand_missing_libraries:
             print("\nGrand Summary of MISSING LIBRARIES across all binaries:")
-            missing_table = PrettyTable(['Missing Library', 'Referenced By'])
-            missing_table.align['Missing Library'] = 'l'
-            missing_table.align['Referenced By'] = 'l'
-            for lib, binaries in sorted(grand_missing_libraries.items()):
-                missing_table.add_row([lib, '\n'.join(sorted(binaries))])
-            print(missing_table)
+            print(format_table(['Missing Library', 'Referenced By'],
+                               [[lib, '\n'.join(sorted(binaries))]
+                                for lib, binaries in sorted(grand_missing_libraries.items())]))
         print("\nGrand Summary of special cases across all binaries:")
         if grand_special_cases:
-            special_table = PrettyTable(['Library/Case', 'Referenced By', 'Category'])
-            special_table.align['Library/Case'] = 'l'
-            special_table.align['Referenced By'] = 'l'
-            special_table.align['Category'] = 'l'
-            for case, binary in sorted(set(grand_special_cases)):
+            rows = []
+            for case, binary in sorted(grand_special_cases):
                 category = "Custom/Non-RPM" if "custom or non-RPM library" in case else "Other"
                 library = case.split(" is ")[0] if " is " in case else case
-                special_table.add_row([library, binary, category])
-            print(special_table)
+                rows.append([library, binary, category])
+            print(format_table(['Library/Case', 'Referenced By', 'Category'], rows))
         else:
             print("No special cases found.")
 
-def analyze_path(path, grand_summary, grand_special_cases, grand_missing_libraries):
+def is_shared_object_name(file_path):
+    return '.so' in os.path.basename(file_path)
+
+def analyze_path(path, grand_summary, grand_special_cases, grand_missing_libraries, jobs=DEFAULT_JOBS,
+                 transitive_skip=True, quiet=False):
     if os.path.isfile(path):
-        packages, special_cases, missing_libraries = process_binary(path)
+        packages, special_cases, missing_libraries, output = process_binary_buffered(path)
+        if not quiet:
+            sys.stdout.write(output)
         for package_name, full_package_name in packages:
             grand_summary[package_name].add(full_package_name)
-        grand_special_cases.extend((case, path) for case in special_cases)
+        grand_special_cases.update((case, path) for case in special_cases)
         for lib in missing_libraries:
             grand_missing_libraries[lib].add(path)
     elif os.path.isdir(path):
-        for root, dirs, files in os.walk(path):
-            for file in files:
-                file_path = os.path.join(root, file)
-                if is_elf_binary(file_path):
-                    packages, special_cases, missing_libraries = process_binary(file_path)
-                    for package_name, full_package_name in packages:
-                        grand_summary[package_name].add(full_package_name)
-                    grand_special_cases.extend((case, file_path) for case in special_cases)
+        # Hardlinked copies are the same binary, so only the first path seen is analyzed
+        # and its results are attributed to every alias.
+        elf_binaries, hardlinks = group_hardlinks(iter_elf_binaries(path))
+        # Workers only wait on ldd/rpm children, so threads are enough; the
+        # buffered output is written in walk order once each binary is done.
+        with concurrent.futures.ThreadPoolExecutor(max_workers=jobs) as executor:
+            executables = [file_path for file_path in elf_binaries if not is_shared_object_name(file_path)]
+            ldd_outputs = list(executor.map(get_ldd_output, executables))
+            if transitive_skip:
+                # ldd reports the full transitive closure, so a shared object that an
+                # executable already pulls in adds nothing a second ldd run would find.
+                covered = {os.path.realpath(lib_path) for ldd_output in ldd_outputs if ldd_output
+                           for lib_path in get_library_paths(ldd_output)}
+                remaining = []
+                for file_path in elf_binaries:
+                    if is_shared_object_name(file_path) and os.path.realpath(file_path) in covered:
+                        if not quiet:
+                            print(f"Skipping {file_path}: already covered by the dependencies of a scanned binary")
+                    else:
+                        remaining.append(file_path)
+                elf_binaries = remaining
+            shared_objects = [file_path for file_path in elf_binaries if is_shared_object_name(file_path)]
+            ldd_outputs += executor.map(get_ldd_output, shared_objects)
+            prime_package_info(lib_path for ldd_output in ldd_outputs if ldd_output
+                               for lib_path in get_library_paths(ldd_output))
+            results = executor.map(process_binary_buffered, elf_binaries)
+            for file_path, (packages, special_cases, missing_libraries, output) in zip(elf_binaries, results):
+                if not quiet:
+                    sys.stdout.write(output)
+                    if hardlinks[file_path]:
+                        print(f"Hardlinked copies of {file_path}: {', '.join(hardlinks[file_path])}")
+                for package_name, full_package_name in packages:
+                    grand_summary[package_name].add(full_package_name)
+                for binary in [file_path] + hardlinks[file_path]:
+                    grand_special_cases.update((case, binary) for case in special_cases)
                     for lib in missing_libraries:
-                        grand_missing_libraries[lib].add(file_path)
+                        grand_missing_libraries[lib].add(binary)
     else:
         print(f"Error: {path} is neither a valid file nor a directory.")
-    if grand_special_cases:
-        print(f"Accumulated special cases after processing {path}:")
-        for case, binary in grand_special_cases:
-            print(f"  - {case} (in {binary})")
-    else:
-        print(f"No special cases accumulated after processing {path}")
 
 def main():
     check_requirements()
     parser = argparse.ArgumentParser(description="ELF Dependency Analyzer")
     parser.add_argument('paths', nargs='+', help="Paths to files or directories to analyze")
     parser.add_argument('--rebuild-cache', action='store_true', help="Force rebuild of the high-level packages cache")
+    parser.add_argument('--jobs', type=int, default=DEFAULT_JOBS,
+                        help=f"Number of binaries or repoquery calls to run concurrently (default: {DEFAULT_JOBS})")
+    parser.add_argument('--local-prefix', action='append', default=[], metavar='PATH',
+                        help="Treat libraries under PATH as custom without querying rpm (can be repeated)")
+    parser.add_argument('--quiet', action='store_true',
+                        help="Only print the grand summary, not the report for each binary")
+    parser.add_argument('--no-transitive-skip', dest='transitive_skip', action='store_false',
+                        help="Also analyze shared objects already reported as dependencies of another binary")
     args = parser.parse_args()
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    global _local_prefixes
+    _local_prefixes = tuple(args.local_prefix)
+    load_package_info_cache()
     grand_summary = defaultdict(set)
-    grand_special_cases = []
+    grand_special_cases = set()
     grand_missing_libraries = defaultdict(set)
     for path in args.paths:
-        analyze_path(path, grand_summary, grand_special_cases, grand_missing_libraries)
-    HIGH_LEVEL_PACKAGES = load_or_build_high_level_packages(grand_summary, args.rebuild_cache)
+        analyze_path(path, grand_summary, grand_special_cases, grand_missing_libraries, args.jobs,
+                     args.transitive_skip, args.quiet)
+    HIGH_LEVEL_PACKAGES = load_or_build_high_level_packages(grand_summary, args.rebuild_cache, args.jobs)
     PACKAGE_TO_HIGH_LEVEL = {low: high for high, lows in HIGH_LEVEL_PACKAGES.items() for low in lows}
     print_grand_summary(grand_summary, grand_special_cases, grand_missing_libraries, HIGH_LEVEL_PACKAGES, PACKAGE_TO_HIGH_LEVEL)
 
@@ -14,13 +14,23 @@ The script provides information about:
 - Other special cases
 
 Usage:
-    python3 elf_dependency_analyzer.py [file_or_directory] [file_or_directory] ...
+    python3 elf_dependency_analyzer.py [--local-prefix PATH] [--use-ldd] [--pretty] [--jobs N] [--processes]
+                                       [file_or_directory] [file_or_directory] ...
+
+Libraries under /usr/local/cloudberry-db, or under any additional --local-prefix path,
+are reported as Cloudberry custom libraries without querying dpkg.
+
+Shared libraries are found by reading each binary's DT_NEEDED entries and resolving them
+the way the dynamic loader does, without running the binary's loader. Pass --use-ldd, or
+run without pyelftools installed, to use ldd instead.
 
 Requirements:
 - Python 3.6+
-- prettytable (pip install prettytable)
+- prettytable (optional, for --pretty; pip install prettytable)
+- pyelftools (optional, pip install pyelftools)
 - ldd (usually pre-installed on Linux systems)
-- file (usually pre-installed on Linux systems)
+- python-magic (optional, pip install python-magic)
+- file (usually pre-installed on Linux systems; not needed with python-magic)
 - dpkg (pre-installed on Ubuntu)
 """
 
@@ -28,112 +38,867 @@ import os
 import subprocess
 import re
 import sys
+import glob
+import shutil
+import functools
+import pickle
+import atexit
+import io
+import stat
+import struct
+import sysconfig
+import contextlib
+import multiprocessing
+import threading
 import argparse
-from collections import defaultdict
-from prettytable import PrettyTable
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+try:
+    from elftools.common.exceptions import ELFError
+    from elftools.elf.elffile import ELFFile
+    from elftools.elf.dynamic import DynamicSection
+except ImportError:
+    ELFFile = None
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:
+    shared_memory = None
+
+try:
+    import magic
+except ImportError:
+    magic = None
+
+DEFAULT_LOCAL_PREFIXES = ('/usr/local/cloudberry-db',)
+
+DEFAULT_JOBS = (os.cpu_count() or 1) * 2
+
+DPKG_INFO_DIR = '/var/lib/dpkg/info'
+DPKG_STATUS_FILE = '/var/lib/dpkg/status'
+CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'elf_dep_analyzer')
+CACHE_FILE = os.path.join(CACHE_DIR, 'cache.pkl')
+
+ELF_MAGIC = b'\x7fELF'
+# ELF e_type values of binaries ldd can analyze: ET_EXEC and ET_DYN.
+ELF_EXECUTABLE_TYPES = (2, 3)
+
+LD_SO_CACHE = '/etc/ld.so.cache'
+LD_SO_CACHE_MAGIC = b'glibc-ld.so.cache1.1'
+# Caches written by glibc before 2.32 may start with an old-format table ahead of the new one.
+LD_SO_CACHE_OLD_MAGIC = b'ld.so-1.7.0'
+# Header: magic, nlibs, len_strings, flags, padding, extension offset, unused words.
+LD_SO_CACHE_HEADER_SIZE = 48
+# Entry: flags, key (soname) offset, value (path) offset, osversion, hwcap.
+LD_SO_CACHE_ENTRY = struct.Struct('=iIIIQ')
+
+# List of core system libraries that might not be individually tracked by dpkg
+CORE_LIBS = {
+    'libc.so': 'libc6',
+    'libm.so': 'libc6',
+    'libdl.so': 'libc6',
+    'libpthread.so': 'libc6',
+    'libresolv.so': 'libc6',
+    'librt.so': 'libc6',
+    'libgcc_s.so': 'libgcc-s1',
+    'libstdc++.so': 'libstdc++6',
+    'libz.so': 'zlib1g',
+    'libbz2.so': 'libbz2-1.0',
+    'libpam.so': 'libpam0g',
+    'libaudit.so': 'libaudit1',
+    'libcap-ng.so': 'libcap-ng0',
+    'libkeyutils.so': 'libkeyutils1',
+    'liblzma.so': 'liblzma5',
+    'libcom_err.so': 'libcomerr2'
+}
+# Report categories of the pseudo packages; every other package is a "System Package".
+PACKAGE_CATEGORIES = {
+    'cloudberry-custom': 'Cloudberry Custom',
+    'system-library': 'System Library',
+}
+
+# Matches a library file name starting with any of the CORE_LIBS prefixes.
+CORE_LIB_RE = re.compile('|'.join(re.escape(core_lib) for core_lib in CORE_LIBS))
+
+# Directories the dynamic loader searches after ld.so.cache; get_system_library_dirs()
+# puts the multiarch directories of the binary's architecture ahead of them.
+DEFAULT_LIBRARY_DIRS = ('/lib', '/usr/lib')
+
+# Matches "name => path (0xaddr)" and "name => not found" lines anywhere in ldd output; the path
+# group is None for the latter. Only blanks, never newlines, are allowed between the fields.
+LDD_LINE_RE = re.compile(r'^[ \t]*(?P<name>\S+)[ \t]+=>[ \t]+(?:(?P<path>\S+)[ \t]+\(0x[0-9a-f]+\)|not found)[ \t]*$',
+                         re.MULTILINE)
+
+# Sonames of the dynamic loader itself, which ldd never lists as a "name => path" dependency.
+LOADER_SONAME_RE = re.compile(r'^ld(?:-linux[\w.-]*|-musl-\w+|64)?\.so(?:\.\d+)*$')
+
+# Matches "\tsoname (libc6,x86-64) => path" lines of `ldconfig -p`.
+LDCONFIG_LINE_RE = re.compile(r'^\s+(?P<soname>\S+) \(.*\) => (?P<path>\S+)$')
+
+_local_prefixes = DEFAULT_LOCAL_PREFIXES
+_use_ldd = False
+_pretty = False
+
+# libmagic handles must not be used from several threads at once.
+_magic_lock = threading.Lock()
+
+# Soname -> library paths from the dynamic loader cache, filled once by load_soname_map().
+_soname_map = {}
+
+# Installed file path -> owning package (as named by its .list file, e.g. "libc6:amd64"),
+# and package -> version. Filled once by load_dpkg_database().
+_dpkg_files = {}
+_dpkg_versions = {}
+
+# Path -> `dpkg -S` output line from batched searches, used when the file lists are
+# unavailable. Paths that were searched but not found map to None.
+_dpkg_search_results = {}
+
+# Results persisted across runs, keyed by (realpath, mtime_ns, size) of the file they describe:
+# library -> get_package_info() result, and binary -> (get_linked_libraries() result,
+# cache keys of the libraries it resolved to).
+# Entries added since the last drain are also kept in the _new_* dicts so that worker
+# processes can hand them back to the parent, which owns the on-disk cache.
+_package_info_cache = {}
+_new_package_info = {}
+_linked_libraries_cache = {}
+_new_linked_libraries = {}
 
-def run_command(command):
+def run_command(command, out=None):
     """
     Execute a shell command and return its output.
 
     Args:
-    command (list): The command to execute as a list of strings.
+    command (tuple): The command to execute as a tuple of strings.
+    out (list): Report lines to append errors to; errors are printed if not given.
 
     Returns:
     str: The output of the command, or None if an error occurred.
     """
+    # universal_newlines rather than text=/capture_output= keeps Python 3.6 support.
+    result = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                            universal_newlines=True)
+    if result.returncode != 0:
+        message = f"Error running command {' '.join(command)}: {(result.stderr or result.stdout).strip()}"
+        if out is None:
+            print(message)
+        else:
+            out.append(message)
+        return None
+    return result.stdout
+
+def parse_ldd_output(ldd_output):
+    """
+    Parse the output of ldd in a single pass over the whole text.
+
+    Args:
+    ldd_output (str): The output of ldd.
+
+    Returns:
+    list: (library name, resolved path) tuples, with path None for libraries ldd
+    reports as not found. Lines that do not map a library to a path are skipped.
+    """
+    return [(match['name'], match['path']) for match in LDD_LINE_RE.finditer(ldd_output)]
+
+@functools.lru_cache(maxsize=None)
+def elf_identity(path):
+    """
+    Read the ELF class, byte order and machine of a file.
+
+    The dynamic loader skips libraries built for another class or machine, so
+    candidates are only accepted when their identity matches the requesting binary.
+
+    Args:
+    path (str): Path to the file.
+
+    Returns:
+    tuple: (EI_CLASS, EI_DATA, e_machine), or None if the file is not an ELF file.
+    """
+    try:
+        with open(path, 'rb') as f:
+            header = f.read(20)
+    except OSError:
+        return None
+    if len(header) < 20 or header[:4] != ELF_MAGIC:
+        return None
+    byteorder = 'big' if header[5:6] == b'\x02' else 'little'
+    return header[4], header[5], int.from_bytes(header[18:20], byteorder)
+
+def parse_ld_so_cache(path=LD_SO_CACHE):
+    """
+    Parse the dynamic loader cache file.
+
+    Args:
+    path (str): Path to the ld.so.cache file.
+
+    Returns:
+    dict: Soname -> list of library paths, in the order the loader prefers them,
+    or None if the file is not in the glibc-ld.so.cache1.1 format.
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    offset = 0
+    if data.startswith(LD_SO_CACHE_OLD_MAGIC):
+        (old_nlibs,) = struct.unpack_from('=I', data, 12)
+        offset = (16 + old_nlibs * 12 + 7) & ~7
+    if data[offset:offset + len(LD_SO_CACHE_MAGIC)] != LD_SO_CACHE_MAGIC:
+        return None
+
+    def string_at(string_offset):
+        # String offsets are relative to the start of the new-format header.
+        start = offset + string_offset
+        return data[start:data.index(b'\0', start)].decode('utf-8', 'surrogateescape')
+
+    (nlibs,) = struct.unpack_from('=I', data, offset + len(LD_SO_CACHE_MAGIC))
+    entries_start = offset + LD_SO_CACHE_HEADER_SIZE
+    entries = data[entries_start:entries_start + nlibs * LD_SO_CACHE_ENTRY.size]
+    sonames = defaultdict(list)
+    for _, key, value, _, _ in LD_SO_CACHE_ENTRY.iter_unpack(entries):
+        sonames[string_at(key)].append(string_at(value))
+    return sonames
+
+def read_ldconfig_output():
+    """
+    Read the dynamic loader cache through `ldconfig -p`.
+
+    Returns:
+    dict: Soname -> list of library paths, in the order the loader cache lists them.
+    """
+    sonames = defaultdict(list)
+    ldconfig = shutil.which('ldconfig') or '/sbin/ldconfig'
+    output = run_command((ldconfig, '-p')) if os.path.exists(ldconfig) else None
+    for line in (output or '').splitlines():
+        match = LDCONFIG_LINE_RE.match(line)
+        if match:
+            sonames[match['soname']].append(match['path'])
+    return sonames
+
+def load_soname_map():
+    """
+    Load the dynamic loader cache into memory.
+
+    /etc/ld.so.cache is parsed directly; `ldconfig -p` is used if the file cannot be read.
+    """
+    try:
+        sonames = parse_ld_so_cache()
+    except (OSError, ValueError, struct.error) as e:
+        print(f"Error reading {LD_SO_CACHE}: {e}")
+        sonames = None
+    if sonames is None:
+        sonames = read_ldconfig_output()
+    _soname_map.update(sonames)
+
+@functools.lru_cache(maxsize=None)
+def read_dynamic_info(path):
+    """
+    Read the dynamic linking information of an ELF file.
+
+    Args:
+    path (str): Path to the ELF file.
+
+    Returns:
+    tuple: The DT_NEEDED sonames, DT_RPATH directories, DT_RUNPATH directories and
+    PT_INTERP path (None if absent), or None if the file has no dynamic section.
+    """
+    with open(path, 'rb') as f:
+        elf = ELFFile(f)
+        interpreter = None
+        for segment in elf.iter_segments():
+            if segment['p_type'] == 'PT_INTERP':
+                interpreter = segment.get_interp_name()
+        for section in elf.iter_sections():
+            if isinstance(section, DynamicSection):
+                needed, rpath, runpath = [], [], []
+                for tag in section.iter_tags():
+                    if tag.entry.d_tag == 'DT_NEEDED':
+                        needed.append(tag.needed)
+                    elif tag.entry.d_tag == 'DT_RPATH':
+                        rpath.extend(tag.rpath.split(':'))
+                    elif tag.entry.d_tag == 'DT_RUNPATH':
+                        runpath.extend(tag.runpath.split(':'))
+                return tuple(needed), tuple(rpath), tuple(runpath), interpreter
+    return None
+
+def expand_origin(directories, origin):
+    """
+    Substitute $ORIGIN in RPATH/RUNPATH entries.
+
+    Args:
+    directories (tuple): Search path entries.
+    origin (str): Directory of the object the entries belong to.
+
+    Returns:
+    tuple: The non-empty entries with $ORIGIN expanded.
+    """
+    return tuple(d.replace('${ORIGIN}', origin).replace('$ORIGIN', origin) for d in directories if d)
+
+@functools.lru_cache(maxsize=None)
+def get_system_library_dirs(interpreter):
+    """
+    List the system directories the dynamic loader searches, in search order.
+
+    Debian and Ubuntu build the loader with the multiarch directories /lib/<triplet>
+    and /usr/lib/<triplet> ahead of /lib and /usr/lib. The triplet is taken from the
+    directory the binary's interpreter lives in, or from Python's build if the binary
+    has no interpreter or it is not in a multiarch directory.
+
+    Args:
+    interpreter (str): PT_INTERP path of the binary, or None.
+
+    Returns:
+    tuple: The system library directories.
+    """
+    triplet = None
+    if interpreter:
+        loader_dir = os.path.dirname(_realpath(interpreter))
+        if os.path.dirname(loader_dir) in DEFAULT_LIBRARY_DIRS:
+            triplet = os.path.basename(loader_dir)
+    triplet = triplet or sysconfig.get_config_var('MULTIARCH')
+    multiarch_dirs = (f'/lib/{triplet}', f'/usr/lib/{triplet}') if triplet else ()
+    return multiarch_dirs + DEFAULT_LIBRARY_DIRS
+
+def find_library(soname, search_dirs, identity, system_dirs):
+    """
+    Locate a shared library the way the dynamic loader does.
+
+    Args:
+    soname (str): The DT_NEEDED entry to resolve.
+    search_dirs (tuple): RPATH, LD_LIBRARY_PATH and RUNPATH directories, in search order.
+    identity (tuple): elf_identity() of the requesting binary.
+    system_dirs (tuple): get_system_library_dirs() of the requesting binary.
+
+    Returns:
+    str: The path of the library, or None if it cannot be found.
+    """
+    if '/' in soname:
+        return soname if elf_identity(soname) == identity else None
+    for directory in search_dirs:
+        candidate = os.path.join(directory, soname)
+        if elf_identity(candidate) == identity:
+            return candidate
+    for candidate in _soname_map.get(soname, ()):
+        if elf_identity(candidate) == identity:
+            return candidate
+    for directory in system_dirs:
+        candidate = os.path.join(directory, soname)
+        if elf_identity(candidate) == identity:
+            return candidate
+    return None
+
+def get_needed_libraries(binary_path):
+    """
+    Resolve the shared libraries a binary loads from its DT_NEEDED entries.
+
+    Dependencies are followed breadth-first, so every library is listed once and in
+    the same order as ldd lists them. The dynamic loader itself is not listed.
+
+    Args:
+    binary_path (str): Path to the binary file.
+
+    Returns:
+    list: (soname, path) tuples, with path None for libraries that cannot be found,
+    or None if the binary is not dynamically linked.
+    """
+    dynamic_info = read_dynamic_info(binary_path)
+    if dynamic_info is None:
+        return None
+
+    identity = elf_identity(binary_path)
+    ld_library_path = tuple(d for d in re.split('[:;]', os.environ.get('LD_LIBRARY_PATH', '')) if d)
+    interpreter = dynamic_info[3]
+    system_dirs = get_system_library_dirs(interpreter)
+    loaded = {os.path.basename(interpreter), _realpath(interpreter)} if interpreter else set()
+    libraries = []
+
+    # Each entry is an object whose dependencies still need resolving, its $ORIGIN and
+    # the RPATH directories inherited from the objects that loaded it.
+    queue = deque([(dynamic_info, os.path.dirname(_realpath(binary_path)), ())])
+    while queue:
+        (needed, rpath, runpath, _), origin, inherited_rpath = queue.popleft()
+        rpath = expand_origin(rpath, origin) + inherited_rpath
+        runpath = expand_origin(runpath, origin)
+        # DT_RUNPATH disables DT_RPATH and is searched after LD_LIBRARY_PATH.
+        search_dirs = ld_library_path + runpath if runpath else rpath + ld_library_path
+
+        for soname in needed:
+            if soname in loaded or LOADER_SONAME_RE.match(soname):
+                continue
+            loaded.add(soname)
+            lib_path = find_library(soname, search_dirs, identity, system_dirs)
+            if lib_path is None:
+                libraries.append((soname, None))
+                continue
+            real_path = _realpath(lib_path)
+            if real_path in loaded:
+                continue
+            loaded.add(real_path)
+            libraries.append((soname, lib_path))
+            try:
+                lib_info = read_dynamic_info(lib_path)
+            except (OSError, ELFError):
+                lib_info = None
+            if lib_info is not None:
+                queue.append((lib_info, os.path.dirname(lib_path), rpath))
+    return libraries
+
+def get_linked_libraries(binary_path, out):
+    """
+    List the shared libraries a binary loads.
+
+    Results are kept in the on-disk cache and reused while the binary and every library
+    it resolved to are unchanged. Results with a library that could not be found are
+    not cached, so they are resolved again on the next run.
+
+    Args:
+    binary_path (str): Path to the binary file.
+    out (list): Report lines to append errors to.
+
+    Returns:
+    list: (library name, path) tuples, with path None for libraries that cannot be
+    found, or None if the binary could not be analyzed.
+    """
+    cache_key = get_cache_key(binary_path)
+    entry = _linked_libraries_cache.get(cache_key)
+    if entry is not None:
+        libraries, library_keys = entry
+        if all(get_cache_key(lib_path) == lib_key
+               for (_, lib_path), lib_key in zip(libraries, library_keys)):
+            return libraries
+
+    libraries = resolve_linked_libraries(binary_path, out)
+    if (cache_key is not None and libraries is not None
+            and all(lib_path is not None for _, lib_path in libraries)):
+        entry = (libraries, tuple(get_cache_key(lib_path) for _, lib_path in libraries))
+        _linked_libraries_cache[cache_key] = entry
+        _new_linked_libraries[cache_key] = entry
+    return libraries
+
+def resolve_linked_libraries(binary_path, out):
+    """
+    Find the shared libraries a binary loads.
+
+    Uses the DT_NEEDED parser when pyelftools is available, and ldd otherwise or
+    when --use-ldd is given.
+
+    Args:
+    binary_path (str): Path to the binary file.
+    out (list): Report lines to append errors to.
+
+    Returns:
+    list: (library name, path) tuples, with path None for libraries that cannot be
+    found, or None if the binary could not be analyzed.
+    """
+    if ELFFile is not None and not _use_ldd:
+        try:
+            libraries = get_needed_libraries(binary_path)
+        except (OSError, ELFError) as e:
+            out.append(f"Error reading {binary_path}, falling back to ldd: {e}")
+        else:
+            if libraries is None:
+                out.append(f"{binary_path}: not a dynamic executable")
+            return libraries
+
+    ldd_output = run_command(('ldd', binary_path), out)
+    if ldd_output is None:
+        return None
+    return parse_ldd_output(ldd_output)
+
+def load_dpkg_database():
+    """
+    Load the dpkg file lists and package versions into memory.
+
+    Reads every /var/lib/dpkg/info/*.list file once so that package lookups do not
+    need to run `dpkg -S` per library. If the lists cannot be read, the lookup
+    falls back to `dpkg -S`.
+    """
+    for list_file in glob.glob(os.path.join(DPKG_INFO_DIR, '*.list')):
+        package = os.path.basename(list_file)[:-len('.list')]
+        try:
+            with open(list_file, encoding='utf-8', errors='surrogateescape') as f:
+                for line in f:
+                    _dpkg_files[line.rstrip('\n')] = package
+        except OSError as e:
+            print(f"Error reading {list_file}: {e}")
+
+    if _dpkg_files and shutil.which('dpkg-query'):
+        output = run_command(('dpkg-query', '-W', '-f=${binary:Package}\t${Version}\n'))
+        for line in (output or '').splitlines():
+            package, _, version = line.partition('\t')
+            _dpkg_versions[package] = version
+
+def find_dpkg_package(lib_path):
+    """
+    Look up the package owning a path in the preloaded dpkg file lists.
+
+    On merged-/usr systems the lists may record /lib/... while the resolved path is
+    /usr/lib/... (or the other way round), so both spellings are tried.
+
+    Args:
+    lib_path (str): The path to the library.
+
+    Returns:
+    str: The owning package name, or None if the path is not known to dpkg.
+    """
+    package = _dpkg_files.get(lib_path)
+    if package is None:
+        if lib_path.startswith('/usr/'):
+            package = _dpkg_files.get(lib_path[len('/usr'):])
+        else:
+            package = _dpkg_files.get('/usr' + lib_path)
+    return package
+
+def get_dpkg_token():
+    """
+    Identify the current state of the dpkg database.
+
+    Returns:
+    str: A token that changes whenever packages are installed or removed, or None
+    if the dpkg status file is unavailable.
+    """
     try:
-        return subprocess.check_output(command, stderr=subprocess.STDOUT).decode('utf-8')
-    except subprocess.CalledProcessError as e:
-        print(f"Error running command {' '.join(command)}: {e.output.decode('utf-8').strip()}")
+        st = os.stat(DPKG_STATUS_FILE)
+    except OSError:
         return None
+    return f"{DPKG_STATUS_FILE}:{st.st_mtime_ns}:{st.st_size}"
 
+def get_loader_token():
+    """
+    Identify the inputs that library resolution depends on besides the binary itself.
+
+    Returns:
+    str: A token that changes with the loader cache, LD_LIBRARY_PATH and --use-ldd.
+    """
+    try:
+        st = os.stat(LD_SO_CACHE)
+        ld_so_cache = f"{st.st_mtime_ns}:{st.st_size}"
+    except OSError:
+        ld_so_cache = None
+    return f"{ld_so_cache}:{os.environ.get('LD_LIBRARY_PATH', '')}:{_use_ldd}"
+
+def get_cache_key(path):
+    """
+    Build the on-disk cache key for a file.
+
+    Args:
+    path (str): Path to the file.
+
+    Returns:
+    tuple: (realpath, mtime_ns, size), or None if the file cannot be stat'ed.
+    """
+    real_path = _realpath(path)
+    try:
+        st = os.stat(real_path)
+    except OSError:
+        return None
+    return real_path, st.st_mtime_ns, st.st_size
+
+def load_pickle(path):
+    """
+    Load a cache file.
+
+    Args:
+    path (str): Path to the cache file.
+
+    Returns:
+    object: The unpickled data, or None if the file is missing or unreadable.
+    """
+    try:
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, KeyError, AttributeError):
+        return None
+
+def save_pickle(path, data):
+    """
+    Write a cache file atomically, so that concurrent or interrupted runs never
+    leave a truncated file behind.
+
+    Args:
+    path (str): Path to the cache file.
+    data (object): The data to pickle.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+def save_cache(dpkg_token, loader_token):
+    """
+    Write the package lookup and linked library caches to disk.
+
+    Args:
+    dpkg_token (str): The dpkg database token the package lookups were computed against.
+    loader_token (str): The loader token the linked libraries were computed against.
+    """
+    try:
+        save_pickle(CACHE_FILE, {'dpkg': dpkg_token, 'packages': _package_info_cache,
+                                 'loader': loader_token, 'linked_libraries': _linked_libraries_cache})
+    except OSError as e:
+        print(f"Error writing cache {CACHE_FILE}: {e}")
+
+def load_cache():
+    """
+    Load the caches from a previous run and save them again on exit.
+
+    Package lookups are discarded when the dpkg database has changed, and linked
+    libraries when the loader token has changed, since they were written.
+    """
+    dpkg_token = get_dpkg_token()
+    loader_token = get_loader_token()
+    cache_data = load_pickle(CACHE_FILE)
+    if isinstance(cache_data, dict):
+        if dpkg_token is not None and cache_data.get('dpkg') == dpkg_token:
+            _package_info_cache.update(cache_data.get('packages', {}))
+        if cache_data.get('loader') == loader_token:
+            _linked_libraries_cache.update(cache_data.get('linked_libraries', {}))
+    atexit.register(save_cache, dpkg_token, loader_token)
+
+def drain_new_cache_entries():
+    """
+    Collect the cache entries added since the last call, for a worker to return to the parent.
+
+    Returns:
+    tuple: New package lookups and new linked library lists.
+    """
+    new_entries = dict(_new_package_info), dict(_new_linked_libraries)
+    _new_package_info.clear()
+    _new_linked_libraries.clear()
+    return new_entries
+
+def merge_cache_entries(new_entries):
+    """
+    Add cache entries returned by a worker to the parent's caches.
+
+    Args:
+    new_entries (tuple): The result of drain_new_cache_entries() in the worker.
+    """
+    new_package_info, new_linked_libraries = new_entries
+    _package_info_cache.update(new_package_info)
+    _linked_libraries_cache.update(new_linked_libraries)
+
+@functools.lru_cache(maxsize=None)
+def _realpath(path):
+    """
+    Memoized os.path.realpath, as the same libraries are resolved for nearly every binary.
+
+    The directory is canonicalized through this same cache, so a new library in a known
+    directory costs one lstat, and readlink only when the library itself is a symlink.
+    """
+    directory, name = os.path.split(path)
+    if not os.path.isabs(path) or name in ('', '.', '..'):
+        return os.path.realpath(path)
+    path = os.path.join(_realpath(directory), name)
+    return os.path.realpath(path) if os.path.islink(path) else path
+
+@functools.lru_cache(maxsize=None)
+def get_magic():
+    """
+    Open a libmagic handle once, loading its compiled magic database.
+
+    Returns:
+    magic.Magic: The handle, or None if python-magic is unavailable or cannot be initialized.
+    """
+    # Only python-magic provides magic.Magic; the file-magic binding of the same name does not.
+    if magic is None or not hasattr(magic, 'Magic'):
+        return None
+    try:
+        return magic.Magic()
+    except Exception as e:
+        print(f"Error initializing libmagic, falling back to file: {e}")
+        return None
+
+@functools.lru_cache(maxsize=None)
+def _file_type(path):
+    """
+    Describe a file like the `file` command does.
+
+    Uses libmagic in-process through python-magic when available, and the `file`
+    command otherwise.
+
+    Args:
+    path (str): Path to the file.
+
+    Returns:
+    str: The output of `file` ("path: description"), or None if it could not be run.
+    """
+    magic_handle = get_magic()
+    if magic_handle is not None:
+        try:
+            with _magic_lock:
+                return f"{path}: {magic_handle.from_file(path)}\n"
+        except (OSError, magic.MagicException):
+            # Let `file` report unreadable paths in its usual wording.
+            pass
+    return run_command(('file', path))
+
+@functools.lru_cache(maxsize=None)
 def get_package_info(lib_path):
     """
     Get package information for a given library path.
 
+    Results for system libraries are also kept in the on-disk cache.
+
     Args:
     lib_path (str): The path to the library.
 
     Returns:
     tuple: A tuple containing the package name and full package information.
     """
-    if lib_path.startswith('/usr/local/cloudberry-db'):
+    # Checked once per distinct path thanks to lru_cache; str.startswith with the prefix
+    # tuple is a single C call, cheaper than encoding the path to compare bytes.
+    if lib_path.startswith(_local_prefixes):
         return "cloudberry-custom", f"Cloudberry custom library: {lib_path}"
 
-    dpkg_output = run_command(['dpkg', '-S', lib_path])
-    if dpkg_output:
-        package_name = dpkg_output.split(':')[0]
-        return package_name, dpkg_output.strip()
-
-    # List of core system libraries that might not be individually tracked by dpkg
-    core_libs = {
-        'libc.so': 'libc6',
-        'libm.so': 'libc6',
-        'libdl.so': 'libc6',
-        'libpthread.so': 'libc6',
-        'libresolv.so': 'libc6',
-        'librt.so': 'libc6',
-        'libgcc_s.so': 'libgcc-s1',
-        'libstdc++.so': 'libstdc++6',
-        'libz.so': 'zlib1g',
-        'libbz2.so': 'libbz2-1.0',
-        'libpam.so': 'libpam0g',
-        'libaudit.so': 'libaudit1',
-        'libcap-ng.so': 'libcap-ng0',
-        'libkeyutils.so': 'libkeyutils1',
-        'liblzma.so': 'liblzma5',
-        'libcom_err.so': 'libcomerr2'
-    }
-
-    lib_name = os.path.basename(lib_path)
-    for core_lib, package in core_libs.items():
-        if lib_name.startswith(core_lib):
-            return package, f"Core system library: {lib_path}"
+    cache_key = get_cache_key(lib_path)
+    if cache_key in _package_info_cache:
+        return _package_info_cache[cache_key]
+
+    package_info = lookup_package_info(lib_path)
+    if cache_key is not None and package_info is not None:
+        _package_info_cache[cache_key] = package_info
+        _new_package_info[cache_key] = package_info
+    return package_info
+
+def search_dpkg_packages(lib_paths):
+    """
+    Look up the owning packages of several libraries with a single `dpkg -S` call.
+
+    Only needed when the dpkg file lists could not be loaded. Libraries that are
+    Cloudberry custom, already searched or in the on-disk cache are skipped.
+
+    Args:
+    lib_paths (iterable): Resolved library paths.
+    """
+    paths = [path for path in dict.fromkeys(lib_paths)
+             if path not in _dpkg_search_results and not path.startswith(_local_prefixes)
+             and get_cache_key(path) not in _package_info_cache]
+    if not paths:
+        return
+    # dpkg -S exits non-zero if any path is unknown, but still reports the others.
+    result = subprocess.run(('dpkg', '-S', *paths), stdout=subprocess.PIPE,
+                            stderr=subprocess.DEVNULL, universal_newlines=True)
+    # Other threads may look at the shared results meanwhile, so they are only
+    # published once every path searched has its final answer.
+    results = dict.fromkeys(paths)
+    for line in result.stdout.splitlines():
+        if line.startswith('diversion by '):
+            continue
+        _, sep, path = line.rpartition(': ')
+        if sep and path in results:
+            results[path] = line
+    _dpkg_search_results.update(results)
+
+def lookup_package_info(lib_path):
+    """
+    Determine which package provides a system library.
+
+    Args:
+    lib_path (str): The path to the library.
+
+    Returns:
+    tuple: A tuple containing the package name and full package information,
+    or None if the library could not be identified.
+    """
+    if _dpkg_files:
+        package = find_dpkg_package(lib_path)
+        if package:
+            version = _dpkg_versions.get(package)
+            full_package_name = f"{package}: {version}" if version else f"{package}: {lib_path}"
+            return package.split(':')[0], full_package_name
+    else:
+        if lib_path in _dpkg_search_results:
+            dpkg_output = _dpkg_search_results[lib_path]
+        else:
+            dpkg_output = run_command(('dpkg', '-S', lib_path))
+        if dpkg_output:
+            package_name = dpkg_output.split(':')[0]
+            return package_name, dpkg_output.strip()
+
+    match = CORE_LIB_RE.match(os.path.basename(lib_path))
+    if match:
+        return CORE_LIBS[match.group(0)], f"Core system library: {lib_path}"
 
     # If not a recognized core library, return as system library
-    file_output = run_command(['file', lib_path])
+    file_output = _file_type(lib_path)
     if file_output:
         return "system-library", f"System library: {lib_path} - {file_output.strip()}"
 
     return None
 
-def print_summary(packages, special_cases, missing_libraries, binary_path):
+def format_table(headers, rows):
     """
-    Print a summary of the dependencies for a binary.
+    Format rows as a left-aligned text table in the same layout as PrettyTable.
 
     Args:
-    packages (list): List of package tuples (package_name, full_package_name).
+    headers (list): Column headers.
+    rows (list): Rows of cell strings; a cell may span several lines.
+
+    Returns:
+    str: The formatted table.
+    """
+    if _pretty:
+        from prettytable import PrettyTable
+        table = PrettyTable(headers)
+        for header in headers:
+            table.align[header] = 'l'
+        for row in rows:
+            table.add_row(row)
+        return table.get_string()
+
+    rows = [[cell.split('\n') for cell in row] for row in rows]
+    widths = [len(header) for header in headers]
+    for row in rows:
+        for i, cell_lines in enumerate(row):
+            widths[i] = max(widths[i], max(len(line) for line in cell_lines))
+    border = '+' + '+'.join('-' * (width + 2) for width in widths) + '+'
+
+    def format_line(cells):
+        return '| ' + ' | '.join(f"{cell:<{width}}" for cell, width in zip(cells, widths)) + ' |'
+
+    lines = [border, format_line(headers), border]
+    for row in rows:
+        for i in range(max(len(cell_lines) for cell_lines in row)):
+            lines.append(format_line(cell_lines[i] if i < len(cell_lines) else '' for cell_lines in row))
+    lines.append(border)
+    return '\n'.join(lines)
+
+def print_summary(packages, special_cases, missing_libraries, binary_path, out):
+    """
+    Add a summary of the dependencies for a binary to its report.
+
+    Args:
+    packages (dict): Package names mapped to sets of full package names.
     special_cases (list): List of special case strings.
     missing_libraries (list): List of missing library names.
     binary_path (str): Path to the binary being analyzed.
+    out (list): Report lines to append to.
     """
-    print("\nSummary of runtime dependencies:")
-    table = PrettyTable(['Category', 'Package/Library', 'Details'])
-    table.align['Category'] = 'l'
-    table.align['Package/Library'] = 'l'
-    table.align['Details'] = 'l'
-
-    categories = {
-        'cloudberry-custom': 'Cloudberry Custom',
-        'system-library': 'System Library',
-    }
+    out.append("\nSummary of runtime dependencies:")
+    rows = []
+    for package_name in sorted(packages):
+        category = PACKAGE_CATEGORIES.get(package_name, 'System Package')
+        rows.extend([category, package_name, full_package_name]
+                    for full_package_name in sorted(packages[package_name]))
 
-    for package_name, full_package_name in sorted(set(packages)):
-        category = categories.get(package_name, 'System Package')
-        table.add_row([category, package_name, full_package_name])
-
-    print(table)
+    out.append(format_table(['Category', 'Package/Library', 'Details'], rows))
 
     if missing_libraries:
-        print("\nMISSING LIBRARIES:")
-        for lib in missing_libraries:
-            print(f"  - {lib}")
+        out.append("\nMISSING LIBRARIES:")
+        out.extend(f"  - {lib}" for lib in missing_libraries)
 
     if special_cases:
-        print("\nSPECIAL CASES:")
-        for case in special_cases:
-            print(f"  - {case}")
+        out.append("\nSPECIAL CASES:")
+        out.extend(f"  - {case}" for case in special_cases)
 
 def process_binary(binary_path):
     """
@@ -143,54 +908,157 @@ def process_binary(binary_path):
     binary_path (str): Path to the binary file.
 
     Returns:
-    tuple: A tuple containing lists of packages, special cases, and missing libraries.
+    tuple: The report text, and a tuple containing the packages (a dict of package names
+    to full package names) and the lists of special cases and missing libraries.
     """
-    print(f"Binary: {binary_path}\n")
-    print("Libraries and their corresponding packages:")
-    packages, special_cases, missing_libraries = [], [], []
-
-    ldd_output = run_command(['ldd', binary_path])
-    if ldd_output is None:
-        return packages, special_cases, missing_libraries
+    out = [f"Binary: {binary_path}\n", "Libraries and their corresponding packages:"]
+    packages, special_cases, missing_libraries = defaultdict(set), [], []
 
-    for line in ldd_output.splitlines():
-        if "=>" not in line:
-            continue
+    libraries = get_linked_libraries(binary_path, out)
+    if libraries is None:
+        return '\n'.join(out) + '\n', (packages, special_cases, missing_libraries)
 
-        parts = line.split('=>')
-        lib_name = parts[0].strip()
-        lib_path = parts[1].split()[0].strip()
-        lib_path = os.path.realpath(lib_path)
+    if not _dpkg_files:
+        search_dpkg_packages(_realpath(lib_path) for _, lib_path in libraries if lib_path is not None)
 
-        if lib_path == "not":
+    for lib_name, lib_path in libraries:
+        if lib_path is None:
             missing_libraries.append(lib_name)
-            print(f"MISSING: {line.strip()}")
+            out.append(f"MISSING: {lib_name} => not found")
         else:
+            lib_path = _realpath(lib_path)
             package_info = get_package_info(lib_path)
             if package_info:
-                print(f"{lib_path} => {package_info[1]}")
-                packages.append(package_info)
+                out.append(f"{lib_path} => {package_info[1]}")
+                packages[package_info[0]].add(package_info[1])
             else:
                 special_case = f"{lib_path} is not found and might be a special case"
                 special_cases.append(special_case)
-                print(f"{lib_path} => Not found, might be a special case")
+                out.append(f"{lib_path} => Not found, might be a special case")
 
-    print_summary(packages, special_cases, missing_libraries, binary_path)
-    print("-------------------------------------------")
-    return packages, special_cases, missing_libraries
+    print_summary(packages, special_cases, missing_libraries, binary_path, out)
+    out.append("-------------------------------------------")
+    return '\n'.join(out) + '\n', (packages, special_cases, missing_libraries)
+
+def process_binary_buffered(binary_path):
+    """
+    Process a binary in a worker process, capturing its report instead of printing it.
+
+    Args:
+    binary_path (str): Path to the binary file.
+
+    Returns:
+    tuple: The report text, the process_binary() result, and the cache entries added
+    while processing it, for the parent's on-disk cache.
+    """
+    # Errors printed by the package lookups are captured too, so that they come out
+    # together with the report instead of interleaving with other workers.
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer):
+        report, result = process_binary(binary_path)
+    return buffer.getvalue() + report, result, drain_new_cache_entries()
+
+def share_preloaded_tables():
+    """
+    Publish the preloaded lookup tables in shared memory for workers that are not forked.
+
+    Forked workers inherit the tables copy-on-write. Workers started with spawn or
+    forkserver would otherwise have to read the dpkg file lists and loader cache again.
+
+    Returns:
+    SharedMemory: The segment holding the pickled tables, or None if workers are
+    forked or shared memory is unavailable (Python < 3.8).
+    """
+    if shared_memory is None or multiprocessing.get_start_method() == 'fork':
+        return None
+    data = pickle.dumps((_dpkg_files, _dpkg_versions, _soname_map, _package_info_cache,
+                         _linked_libraries_cache), protocol=pickle.HIGHEST_PROTOCOL)
+    segment = shared_memory.SharedMemory(create=True, size=len(data))
+    segment.buf[:len(data)] = data
+    return segment
+
+def attach_preloaded_tables(name):
+    """
+    Load the lookup tables published by share_preloaded_tables() into this process.
+
+    Args:
+    name (str): Name of the shared memory segment.
+    """
+    segment = shared_memory.SharedMemory(name=name)
+    try:
+        # The segment may be longer than the pickle; loads() stops at its end.
+        dpkg_files, dpkg_versions, soname_map, package_info, linked_libraries = pickle.loads(segment.buf)
+    finally:
+        segment.close()
+    _dpkg_files.update(dpkg_files)
+    _dpkg_versions.update(dpkg_versions)
+    _soname_map.update(soname_map)
+    _package_info_cache.update(package_info)
+    _linked_libraries_cache.update(linked_libraries)
+
+def init_worker(local_prefixes, use_ldd, pretty, shared_tables):
+    """
+    Prepare a worker process for process_binary_buffered().
+
+    Forked workers inherit the dpkg file lists and loader cache; other workers attach to
+    the shared memory copy, or load them again if there is none.
+
+    Args:
+    local_prefixes (tuple): Library path prefixes reported as Cloudberry custom libraries.
+    use_ldd (bool): Whether to find shared libraries with ldd instead of DT_NEEDED.
+    pretty (bool): Whether to format tables with PrettyTable.
+    shared_tables (str): Name of the shared memory segment with the lookup tables, or None.
+    """
+    global _local_prefixes, _use_ldd, _pretty
+    _local_prefixes = local_prefixes
+    _use_ldd = use_ldd
+    _pretty = pretty
+    if shared_tables is not None:
+        attach_preloaded_tables(shared_tables)
+    if not _dpkg_files:
+        load_dpkg_database()
+    if not _soname_map and ELFFile is not None and not use_ldd:
+        load_soname_map()
+
+def has_elf_header(file_path):
+    """
+    Check whether a file starts with the header of an ELF executable or shared object.
+
+    Args:
+    file_path (str): Path to the file.
+
+    Returns:
+    bool: True if the file has the ELF magic number followed by an e_type of
+    executable or shared object.
+    """
+    try:
+        with open(file_path, 'rb') as f:
+            header = f.read(18)
+    except OSError:
+        return False
+    if len(header) < 18 or header[:4] != ELF_MAGIC:
+        return False
+    byteorder = 'big' if header[5:6] == b'\x02' else 'little'
+    return int.from_bytes(header[16:18], byteorder) in ELF_EXECUTABLE_TYPES
 
 def is_elf_binary(file_path):
     """
     Check if a file is an ELF binary.
 
+    Symlinks are not followed, so each binary is reported under its real name only.
+
     Args:
     file_path (str): Path to the file.
 
     Returns:
     bool: True if the file is an ELF binary, False otherwise.
     """
-    file_output = run_command(['file', file_path])
-    return 'ELF' in file_output and ('executable' in file_output or 'shared object' in file_output)
+    try:
+        if not stat.S_ISREG(os.lstat(file_path).st_mode):
+            return False
+    except OSError:
+        return False
+    return has_elf_header(file_path)
 
 def print_grand_summary(grand_summary, grand_special_cases, grand_missing_libraries):
     """
@@ -198,73 +1066,193 @@ def print_grand_summary(grand_summary, grand_special_cases, grand_missing_librar
 
     Args:
     grand_summary (dict): Dictionary of all packages and their details.
-    grand_special_cases (list): List of all special cases.
+    grand_special_cases (set): Set of all (special case, binary) pairs.
     grand_missing_libraries (dict): Dictionary of all missing libraries.
     """
     if grand_summary or grand_special_cases or grand_missing_libraries:
         print("\nGrand Summary of runtime packages required across all binaries:")
-        table = PrettyTable(['Package', 'Included Packages'])
-        table.align['Package'] = 'l'
-        table.align['Included Packages'] = 'l'
-        for package_name, full_package_names in sorted(grand_summary.items()):
-            included_packages = '\n'.join(sorted(full_package_names))
-            table.add_row([package_name, included_packages])
-        print(table)
+        rows = [[package_name, '\n'.join(sorted(full_package_names))]
+                for package_name, full_package_names in sorted(grand_summary.items())]
+        print(format_table(['Package', 'Included Packages'], rows))
 
         if grand_missing_libraries:
             print("\nGrand Summary of MISSING LIBRARIES across all binaries:")
-            missing_table = PrettyTable(['Missing Library', 'Referenced By'])
-            missing_table.align['Missing Library'] = 'l'
-            missing_table.align['Referenced By'] = 'l'
-            for lib, binaries in sorted(grand_missing_libraries.items()):
-                missing_table.add_row([lib, '\n'.join(sorted(binaries))])
-            print(missing_table)
+            rows = [[lib, '\n'.join(sorted(binaries))]
+                    for lib, binaries in sorted(grand_missing_libraries.items())]
+            print(format_table(['Missing Library', 'Referenced By'], rows))
 
         print("\nGrand Summary of special cases across all binaries:")
         if grand_special_cases:
-            special_table = PrettyTable(['Library/Case', 'Referenced By', 'Category'])
-            special_table.align['Library/Case'] = 'l'
-            special_table.align['Referenced By'] = 'l'
-            special_table.align['Category'] = 'l'
-            for case, binary in sorted(set(grand_special_cases)):
+            rows = []
+            for case, binary in sorted(grand_special_cases):
                 category = "System Library" if "system library" in case else "Other"
                 library = case.split(" is ")[0] if " is " in case else case
-                special_table.add_row([library, binary, category])
-            print(special_table)
+                rows.append([library, binary, category])
+            print(format_table(['Library/Case', 'Referenced By', 'Category'], rows))
         else:
             print("No special cases found.")
 
-def analyze_path(path, grand_summary, grand_special_cases, grand_missing_libraries):
+def merge_results(binary_path, result, grand_summary, grand_special_cases, grand_missing_libraries):
     """
-    Analyze a file or directory for ELF binaries and their dependencies.
+    Add the dependencies of one binary to the grand summary.
 
     Args:
-    path (str): Path to the file or directory to analyze.
+    binary_path (str): Path to the binary the result belongs to.
+    result (tuple): The packages, special cases and missing libraries from process_binary().
     grand_summary (dict): Dictionary to store all package information.
-    grand_special_cases (list): List to store all special cases.
+    grand_special_cases (set): Set to store all special cases.
     grand_missing_libraries (dict): Dictionary to store all missing libraries.
     """
-    if os.path.isfile(path):
-        if is_elf_binary(path):
-            packages, special_cases, missing_libraries = process_binary(path)
-            for package_name, full_package_name in packages:
-                grand_summary[package_name].add(full_package_name)
-            grand_special_cases.extend((case, path) for case in special_cases)
-            for lib in missing_libraries:
-                grand_missing_libraries[lib].add(path)
-    elif os.path.isdir(path):
-        for root, dirs, files in os.walk(path):
-            for file in files:
-                file_path = os.path.join(root, file)
-                if is_elf_binary(file_path):
-                    packages, special_cases, missing_libraries = process_binary(file_path)
-                    for package_name, full_package_name in packages:
-                        grand_summary[package_name].add(full_package_name)
-                    grand_special_cases.extend((case, file_path) for case in special_cases)
-                    for lib in missing_libraries:
-                        grand_missing_libraries[lib].add(file_path)
-    else:
-        print(f"Error: {path} is neither a valid file nor a directory.")
+    packages, special_cases, missing_libraries = result
+    for package_name, full_package_names in packages.items():
+        grand_summary[package_name] |= full_package_names
+    grand_special_cases.update((case, binary_path) for case in special_cases)
+    for lib in missing_libraries:
+        grand_missing_libraries[lib].add(binary_path)
+
+def walk_elf(directory):
+    """
+    Find the ELF binaries under a directory.
+
+    Directory entries carry their file type from readdir, so regular files are found
+    without a stat call each. Like os.walk, a directory's files come before its
+    subdirectories, symlinks are not followed and unreadable directories are skipped.
+
+    Args:
+    directory (str): Directory to walk.
+
+    Yields:
+    str: Paths of the ELF binaries, in walk order.
+    """
+    try:
+        with os.scandir(directory) as it:
+            entries = list(it)
+    except OSError:
+        return
+    subdirectories = []
+    for entry in entries:
+        if entry.is_dir(follow_symlinks=False):
+            subdirectories.append(entry.path)
+        elif entry.is_file(follow_symlinks=False) and has_elf_header(entry.path):
+            yield entry.path
+    for subdirectory in subdirectories:
+        yield from walk_elf(subdirectory)
+
+def file_size(file_path):
+    """
+    Return the size of a file, or 0 if it cannot be determined.
+    """
+    try:
+        return os.path.getsize(file_path)
+    except OSError:
+        return 0
+
+def process_binaries_in_processes(binaries, jobs):
+    """
+    Process binaries in a pool of worker processes.
+
+    Args:
+    binaries (list): Paths of the binaries to process.
+    jobs (int): Number of worker processes.
+
+    Yields:
+    tuple: The binary path, its report text and its process_binary() result, in the
+    order of binaries.
+    """
+    segment = share_preloaded_tables()
+    try:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=init_worker,
+                                 initargs=(_local_prefixes, _use_ldd, _pretty,
+                                           segment.name if segment else None)) as executor:
+            futures = submit_largest_first(executor, process_binary_buffered, binaries)
+            for file_path, future in zip(binaries, futures):
+                output, result, new_cache_entries = future.result()
+                merge_cache_entries(new_cache_entries)
+                yield file_path, output, result
+    finally:
+        if segment is not None:
+            segment.close()
+            segment.unlink()
+
+def process_binaries_in_threads(binaries, jobs):
+    """
+    Process binaries in a pool of threads sharing this process's lookup tables and caches.
+
+    Args:
+    binaries (list): Paths of the binaries to process.
+    jobs (int): Number of threads.
+
+    Yields:
+    tuple: The binary path, its report text and its process_binary() result, in the
+    order of binaries.
+    """
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        futures = submit_largest_first(executor, process_binary, binaries)
+        for file_path, future in zip(binaries, futures):
+            report, result = future.result()
+            yield file_path, report, result
+
+def submit_largest_first(executor, fn, binaries):
+    """
+    Submit one task per binary, largest binaries first.
+
+    Scheduling by size keeps a big binary from ending up running alone at the end.
+
+    Args:
+    executor (Executor): The pool to submit to.
+    fn (callable): The function to call with each binary path.
+    binaries (list): Paths of the binaries; the same path may appear more than once.
+
+    Returns:
+    list: The futures, in the order of binaries.
+    """
+    futures = [None] * len(binaries)
+    for i in sorted(range(len(binaries)), key=lambda i: file_size(binaries[i]), reverse=True):
+        futures[i] = executor.submit(fn, binaries[i])
+    return futures
+
+def iter_inputs(paths):
+    """
+    Expand the command-line paths into the ELF binaries to analyze.
+
+    Args:
+    paths (list): Paths to files or directories.
+
+    Yields:
+    str: Paths of the ELF binaries, in argument and walk order.
+    """
+    for path in paths:
+        if os.path.isfile(path):
+            if is_elf_binary(path):
+                yield path
+        elif os.path.isdir(path):
+            yield from walk_elf(path)
+        else:
+            print(f"Error: {path} is neither a valid file nor a directory.")
+
+def analyze_paths(paths, grand_summary, grand_special_cases, grand_missing_libraries,
+                  jobs=DEFAULT_JOBS, use_processes=False):
+    """
+    Analyze files and directories for ELF binaries and their dependencies.
+
+    All binaries are processed in parallel, in threads or worker processes; their
+    reports are printed in argument and walk order once each binary is done.
+
+    Args:
+    paths (list): Paths to the files or directories to analyze.
+    grand_summary (dict): Dictionary to store all package information.
+    grand_special_cases (set): Set to store all special cases.
+    grand_missing_libraries (dict): Dictionary to store all missing libraries.
+    jobs (int): Number of binaries to process in parallel.
+    use_processes (bool): Whether to use worker processes instead of threads.
+    """
+    binaries = list(iter_inputs(paths))
+    if not binaries:
+        return
+    process_binaries = process_binaries_in_processes if use_processes else process_binaries_in_threads
+    for file_path, report, result in process_binaries(binaries, jobs):
+        sys.stdout.write(report)
+        merge_results(file_path, result, grand_summary, grand_special_cases, grand_missing_libraries)
 
 def main():
     """
@@ -272,14 +1260,36 @@ def main():
     """
     parser = argparse.ArgumentParser(description="ELF Dependency Analyzer for Ubuntu")
     parser.add_argument('paths', nargs='+', help="Paths to files or directories to analyze")
+    parser.add_argument('--local-prefix', action='append', default=[], metavar='PATH',
+                        help="Treat libraries under PATH as Cloudberry custom libraries (can be repeated)")
+    parser.add_argument('--use-ldd', action='store_true',
+                        help="Find shared libraries with ldd instead of reading DT_NEEDED entries")
+    parser.add_argument('--pretty', action='store_true',
+                        help="Format tables with prettytable instead of the built-in formatter")
+    parser.add_argument('--jobs', type=int, default=DEFAULT_JOBS, metavar='N',
+                        help=f"Number of binaries to analyze in parallel (default: {DEFAULT_JOBS})")
+    parser.add_argument('--processes', action='store_true',
+                        help="Analyze binaries in worker processes instead of threads")
     args = parser.parse_args()
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+
+    global _local_prefixes, _use_ldd, _pretty
+    # Repeated --local-prefix values would only add comparisons to every prefix check.
+    _local_prefixes = tuple(dict.fromkeys(DEFAULT_LOCAL_PREFIXES + tuple(args.local_prefix)))
+    _use_ldd = args.use_ldd
+    _pretty = args.pretty
+    load_dpkg_database()
+    if ELFFile is not None and not _use_ldd:
+        load_soname_map()
+    load_cache()
 
     grand_summary = defaultdict(set)
-    grand_special_cases = []
+    grand_special_cases = set()
     grand_missing_libraries = defaultdict(set)
 
-    for path in args.paths:
-        analyze_path(path, grand_summary, grand_special_cases, grand_missing_libraries)
+    analyze_paths(args.paths, grand_summary, grand_special_cases, grand_missing_libraries,
+                  args.jobs, args.processes)
 
     print_grand_summary(grand_summary, grand_special_cases, grand_missing_libraries)
 